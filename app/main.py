@@ -1,69 +1,227 @@
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 import html
 import asyncio
-from collections import Counter, defaultdict
-import re
+import heapq
+import math
+import sys
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from operator import itemgetter
 
 import httpx
-from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import HTMLResponse, JSONResponse
-
-app = FastAPI(title="Author Profile Analysis (OpenAlex)", version="4.4")
+import numpy as np
+import orjson
+from numba import njit
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, ORJSONResponse, StreamingResponse
 
 OPENALEX = "https://api.openalex.org"
+USER_AGENT = "AuthorProfileAnalysis/4.4"
 
 TOP_PAPERS = 30
 TOP_COAUTHORS = 30
 
 MAX_AUTHORS_DISPLAY = 12
 
+# At least this many dated works: citation rates are pre-ranked by the compiled
+# top_rate_indices kernel.
+RATE_VECTORIZE_MIN_WORKS = 1000
+
+MAX_WORKS = 15000
+# OpenAlex only serves page= pagination for the first 10,000 results.
+OPENALEX_PAGE_LIMIT = 10000
+PAGE_CONCURRENCY = 10
+
+# Root-level fields actually used downstream; OpenAlex drops the rest
+# (abstract_inverted_index, referenced_works, concepts, ...) server-side.
+WORKS_SELECT = "id,doi,title,publication_year,cited_by_count,type,primary_location,authorships"
+CONCEPTS_SELECT = "cited_by_count,concepts"
+
+# OpenAlex data is effectively static within a day.
+CACHE_TTL_SECONDS = 24 * 3600
+
 
 def current_year() -> int:
     return datetime.now().year
 
 
+# ----------------------------
+# In-process cache
+# ----------------------------
+class TTLCache:
+    """
+    Small LRU cache whose entries expire `ttl` seconds after being stored.
+    """
+
+    def __init__(self, maxsize: int, ttl: float = CACHE_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Any) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Any, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+# Raw works lists are not cached (a 15k-work author is ~200 MB of dicts);
+# only the small build_rankings output is.
+RANKINGS_CACHE = TTLCache(maxsize=256)
+CONCEPTS_CACHE = TTLCache(maxsize=1024)
+RENDERED_CACHE = TTLCache(maxsize=256)
+
+# Concept lookups currently running, keyed like CONCEPTS_CACHE.
+CONCEPTS_IN_FLIGHT: Dict[Any, "asyncio.Future[List[str]]"] = {}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled HTTP/2 client for the whole process: keeps TLS connections
+    # to OpenAlex alive across requests and multiplexes the concept fan-out.
+    app.state.client = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        timeout=50,
+        headers={"User-Agent": USER_AGENT},
+    )
+    try:
+        yield
+    finally:
+        await app.state.client.aclose()
+
+
+app = FastAPI(
+    title="Author Profile Analysis (OpenAlex)",
+    version="4.4",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+
 # ----------------------------
 # OpenAlex: works + author search
 # ----------------------------
-async def fetch_openalex_works(author_id: str, per_page: int = 200) -> List[Dict[str, Any]]:
+async def get_openalex_json(
+    client: httpx.AsyncClient,
+    url: str,
+    params: Dict[str, str],
+) -> Dict[str, Any]:
+    r = await client.get(url, params=params)
+    if r.status_code != 200:
+        raise HTTPException(502, detail=f"OpenAlex error: {r.status_code} {r.text[:200]}")
+    return orjson.loads(r.content)
+
+
+async def fetch_openalex_works(
+    client: httpx.AsyncClient,
+    author_id: str,
+    per_page: int = 200,
+) -> List[Dict[str, Any]]:
     """
     author_id: full OpenAlex author id like 'https://openalex.org/A123...'
                or short like 'A123...'
-    Returns raw works from OpenAlex (with authorships, type, etc.).
+    Returns raw works from OpenAlex, restricted to WORKS_SELECT fields.
+
+    The first page gives meta.count; the remaining pages are then fetched
+    concurrently. Authors beyond OpenAlex's page= limit, or pages that came
+    back incomplete, fall back to sequential cursor paging.
     """
     if author_id.startswith("http"):
         author = author_id
     else:
         author = f"https://openalex.org/{author_id}"
 
+    url = f"{OPENALEX}/works"
+    params = {
+        "filter": f"authorships.author.id:{author}",
+        "per-page": str(per_page),
+        "select": WORKS_SELECT,
+    }
+
+    data = await get_openalex_json(client, url, {**params, "page": "1"})
+    count = int((data.get("meta") or {}).get("count") or 0)
+    if count > OPENALEX_PAGE_LIMIT:
+        # Cursor paging must start from "*", so this page-1 response is
+        # discarded: one extra request next to the 50+ cursor pages needed.
+        return await fetch_openalex_works_by_cursor(client, url, params)
+
+    works: List[Dict[str, Any]] = list(data.get("results", []))
+    n_pages = math.ceil(count / per_page)
+    sem = asyncio.Semaphore(PAGE_CONCURRENCY)
+
+    async def fetch_page(page: int) -> List[Dict[str, Any]]:
+        async with sem:
+            page_data = await get_openalex_json(client, url, {**params, "page": str(page)})
+        return page_data.get("results", [])
+
+    pages = await asyncio.gather(*(fetch_page(p) for p in range(2, n_pages + 1)))
+    for results in pages:
+        works.extend(results)
+
+    # Independent page= requests share no snapshot or unique sort order, so a
+    # work can come back on two pages; it must not be counted twice. A repeat
+    # also means another work was skipped: redo the walk with a cursor, which
+    # is consistent by construction.
+    unique = dedupe_works(works)
+    if len(unique) < count:
+        return await fetch_openalex_works_by_cursor(client, url, params)
+    return unique
+
+
+def dedupe_works(works: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Keep the first occurrence of each work id (works without an id are kept).
+    """
+    seen = set()
+    unique: List[Dict[str, Any]] = []
+    for w in works:
+        wid = w.get("id")
+        if wid is not None:
+            if wid in seen:
+                continue
+            seen.add(wid)
+        unique.append(w)
+    return unique
+
+
+async def fetch_openalex_works_by_cursor(
+    client: httpx.AsyncClient,
+    url: str,
+    params: Dict[str, str],
+) -> List[Dict[str, Any]]:
     works: List[Dict[str, Any]] = []
     cursor = "*"
 
-    async with httpx.AsyncClient(timeout=50) as client:
-        while True:
-            url = f"{OPENALEX}/works"
-            params = {
-                "filter": f"authorships.author.id:{author}",
-                "per-page": str(per_page),
-                "cursor": cursor,
-            }
-            r = await client.get(url, params=params, headers={"User-Agent": "AuthorProfileAnalysis/4.4"})
-            if r.status_code != 200:
-                raise HTTPException(502, detail=f"OpenAlex error: {r.status_code} {r.text[:200]}")
-
-            data = r.json()
-            results = data.get("results", [])
-            works.extend(results)
+    while True:
+        data = await get_openalex_json(client, url, {**params, "cursor": cursor})
+        results = data.get("results", [])
+        works.extend(results)
 
-            meta = data.get("meta", {})
-            next_cursor = meta.get("next_cursor")
-            if not next_cursor:
-                break
-            cursor = next_cursor
+        meta = data.get("meta", {})
+        next_cursor = meta.get("next_cursor")
+        if not next_cursor:
+            break
+        cursor = next_cursor
 
-            if len(works) > 15000:
-                break
+        if len(works) > MAX_WORKS:
+            break
 
     return works
 
@@ -119,18 +277,44 @@ async def compute_author_concepts(
     """
     Compute reliable concepts for an author by aggregating concepts
     on their most cited works (helps disambiguation).
+    Served from CONCEPTS_CACHE when possible; concurrent callers asking for
+    the same author share a single in-flight OpenAlex request.
     """
+    cache_key = (author_id, top_works, top_concepts)
+    cached = CONCEPTS_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    task = CONCEPTS_IN_FLIGHT.get(cache_key)
+    if task is None:
+        task = asyncio.ensure_future(
+            fetch_author_concepts(client, author_id, top_works=top_works, top_concepts=top_concepts)
+        )
+        CONCEPTS_IN_FLIGHT[cache_key] = task
+        task.add_done_callback(lambda _: CONCEPTS_IN_FLIGHT.pop(cache_key, None))
+
+    # Shielded: one caller being cancelled must not cancel the shared request.
+    return await asyncio.shield(task)
+
+
+async def fetch_author_concepts(
+    client: httpx.AsyncClient,
+    author_id: str,
+    top_works: int = 20,
+    top_concepts: int = 3,
+) -> List[str]:
     url = f"{OPENALEX}/works"
     params = {
         "filter": f"authorships.author.id:{author_id}",
         "per-page": str(min(top_works, 200)),
         "sort": "cited_by_count:desc",
+        "select": CONCEPTS_SELECT,
     }
-    r = await client.get(url, params=params, headers={"User-Agent": "AuthorProfileAnalysis/4.4"})
+    r = await client.get(url, params=params)
     if r.status_code != 200:
         return []
 
-    data = r.json()
+    data = orjson.loads(r.content)
     works = data.get("results", []) or []
 
     scores: Dict[str, float] = {}
@@ -150,21 +334,23 @@ async def compute_author_concepts(
             scores[name] = scores.get(name, 0.0) + 1.0 + 0.0005 * cited
 
     best = sorted(scores.items(), key=lambda x: x[1], reverse=True)
-    return [name for name, _ in best[:top_concepts]]
+    concepts = [name for name, _ in best[:top_concepts]]
+    CONCEPTS_CACHE.set((author_id, top_works, top_concepts), concepts)
+    return concepts
 
 
-async def search_openalex_authors(name: str, per_page: int = 8) -> List[Dict[str, Any]]:
+async def search_openalex_authors(
+    client: httpx.AsyncClient,
+    name: str,
+    per_page: int = 8,
+) -> List[Dict[str, Any]]:
     """
     Search OpenAlex authors and enrich each candidate with reliable concepts.
     """
-    async with httpx.AsyncClient(timeout=30) as client:
-        url = f"{OPENALEX}/authors"
-        params = {"search": name, "per-page": str(per_page)}
-        r = await client.get(url, params=params, headers={"User-Agent": "AuthorProfileAnalysis/4.4"})
-        if r.status_code != 200:
-            raise HTTPException(502, detail=f"OpenAlex error: {r.status_code} {r.text[:200]}")
-        data = r.json()
-        results = data.get("results", [])
+    url = f"{OPENALEX}/authors"
+    params = {"search": name, "per-page": str(per_page)}
+    data = await get_openalex_json(client, url, params)
+    results = data.get("results", [])
 
     out: List[Dict[str, Any]] = []
     for a in results:
@@ -181,18 +367,17 @@ async def search_openalex_authors(name: str, per_page: int = 8) -> List[Dict[str
     top_works_per_author = 20
     top_concepts_per_author = 3
 
-    async with httpx.AsyncClient(timeout=40) as client:
-        tasks = [
-            compute_author_concepts(
-                client,
-                author_id=item["id"],
-                top_works=top_works_per_author,
-                top_concepts=top_concepts_per_author,
-            )
-            for item in out
-            if item.get("id")
-        ]
-        concepts_list = await asyncio.gather(*tasks, return_exceptions=True)
+    tasks = [
+        compute_author_concepts(
+            client,
+            author_id=item["id"],
+            top_works=top_works_per_author,
+            top_concepts=top_concepts_per_author,
+        )
+        for item in out
+        if item.get("id")
+    ]
+    concepts_list = await asyncio.gather(*tasks, return_exceptions=True)
 
     idx = 0
     for item in out:
@@ -213,30 +398,78 @@ def citation_rate(citations: int, year: int, now_year: int) -> float:
     return citations / (1 + age)
 
 
-def compute_rate_ranking(works: List[Dict[str, Any]], top_n: int = TOP_PAPERS) -> List[Dict[str, Any]]:
-    now = current_year()
-    rated = []
-
-    for w in works:
-        y = w.get("year")
-        if not isinstance(y, int):
+@njit(cache=True)
+def top_rate_indices(cites: np.ndarray, years: np.ndarray, now: int, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compiled kernel: citation rates of all works plus the indices of the k
+    highest rates, best first, kept in an inline insertion-sorted buffer.
+    """
+    n = cites.shape[0]
+    rates = np.empty(n, dtype=np.float64)
+    top = np.empty(k, dtype=np.int64)
+    m = 0
+
+    for i in range(n):
+        age = now - years[i]
+        if age < 0:
+            age = 0
+        r = cites[i] / (1.0 + age)
+        rates[i] = r
+
+        if m < k:
+            j = m
+            m += 1
+        elif r > rates[top[k - 1]]:
+            j = k - 1
+        else:
             continue
-        cites = int(w.get("citations") or 0)
-        rate = citation_rate(cites, y, now)
-        item = dict(w)
-        item["citation_rate"] = rate
-        rated.append(item)
-
-    rated.sort(
-        key=lambda x: (
-            x.get("citation_rate", 0.0),
-            x.get("citations", 0),
-            x.get("year", 0),
-            (x.get("title") or ""),
-        ),
-        reverse=True,
-    )
-    return rated[:top_n]
+        while j > 0 and rates[top[j - 1]] < r:
+            top[j] = top[j - 1]
+            j -= 1
+        top[j] = i
+
+    return top[:m], rates
+
+
+def rate_ranking_candidates(years: List[int], cites: List[int], now: int, top_n: int) -> List[int]:
+    """
+    Pre-selection for large works lists (needs 0 < top_n <= len(years)).
+    Returns, in their original order, the indices whose citation rate reaches
+    the top_n-th largest rate (ties included), so the exact sort only sees those.
+    """
+    n = len(years)
+    years_arr = np.fromiter(years, dtype=np.int64, count=n)
+    cites_arr = np.fromiter(cites, dtype=np.int64, count=n)
+    top, rates = top_rate_indices(cites_arr, years_arr, now, top_n)
+
+    kth = rates[top[-1]]
+    return np.flatnonzero(rates >= kth).tolist()
+
+
+def select_top_rated(
+    years: List[int],
+    cites: List[int],
+    titles: List[str],
+    now: int,
+    top_n: int,
+) -> List[Tuple[int, float]]:
+    """
+    Rank parallel (year, citations, title) lists by
+    (citation rate, citations, year, title), best first.
+    Returns (index, citation_rate) pairs for the top_n entries.
+    """
+    candidates: Any = range(len(years))
+    if len(years) >= RATE_VECTORIZE_MIN_WORKS and 0 < top_n < len(years):
+        candidates = rate_ranking_candidates(years, cites, now, top_n)
+
+    # Sort keys are built once per candidate; the heap reads them back with
+    # a C-level itemgetter instead of calling a Python lambda.
+    keyed = [
+        ((citation_rate(cites[i], years[i], now), cites[i], years[i], titles[i]), i)
+        for i in candidates
+    ]
+    top = heapq.nlargest(top_n, keyed, key=itemgetter(0))
+    return [(i, key[0]) for key, i in top]
 
 
 # ----------------------------
@@ -249,105 +482,220 @@ def _canonical_author_id(openalex_author_id: str) -> str:
 
 
 def is_published_article(raw_work: Dict[str, Any]) -> bool:
-    return (raw_work.get("type") or "").lower().strip() == "article"
+    # OpenAlex type slugs are already lowercase ("article", "book-chapter", ...).
+    return raw_work.get("type") == "article"
 
 
+@lru_cache(maxsize=65536)
 def normalize_person_name(name: str) -> str:
     if not name:
         return ""
-    s = name.strip().lower()
-    s = re.sub(r"\s+", " ", s)
-    return s
-
-
-def compute_coauthor_ranking_articles_only_merge_by_name(
-    raw_works: List[Dict[str, Any]],
-    main_author_id: str,
-    top_n: int = TOP_COAUTHORS
-) -> Tuple[List[Dict[str, Any]], int]:
-    main_id = _canonical_author_id(main_author_id)
+    # str.split() collapses whitespace runs in C, faster than a regex sub.
+    # Memoized: the same display names recur across an author's works.
+    # Interned: spelling variants ("J. Smith", "j.  smith") share one key
+    # object, so tally lookups hit the identity fast path.
+    return sys.intern(" ".join(name.lower().split()))
+
+
+def tally_coauthors(
+    raw_work: Dict[str, Any],
+    main_id: str,
+    name_counts: Dict[str, int],
+    name_ids: Dict[str, Dict[str, int]],
+    name_display: Dict[str, str],
+) -> None:
+    """
+    Add one work's co-authors (merged by normalized name) to the tallies.
+    """
+    # Bind the module-level function to a local: saves a global lookup on
+    # every authorship of this work.
+    normalize = normalize_person_name
 
-    name_counts: Counter[str] = Counter()
-    name_display: Dict[str, str] = {}
-    name_ids: Dict[str, Counter[str]] = defaultdict(Counter)
+    for a in raw_work.get("authorships") or ():
+        author = (a.get("author") or {})
+        aid = author.get("id")
+        if not aid or aid == main_id:
+            continue
 
-    article_works = [w for w in raw_works if is_published_article(w)]
+        disp = author.get("display_name") or "Unknown"
+        key = normalize(disp)
+        if not key:
+            continue
 
-    for w in article_works:
-        authorships = w.get("authorships") or []
-        for a in authorships:
-            author = (a.get("author") or {})
-            aid = author.get("id")
-            if not aid or aid == main_id:
-                continue
+        name_counts[key] = name_counts.get(key, 0) + 1
+        ids = name_ids.get(key)
+        if ids is None:
+            ids = name_ids[key] = {}
+        ids[aid] = ids.get(aid, 0) + 1
 
-            disp = author.get("display_name") or "Unknown"
-            key = normalize_person_name(disp)
-            if not key:
-                continue
+        # Keep the longest display name seen for this key.
+        prev = name_display.get(key)
+        if prev is None or len(disp) > len(prev):
+            name_display[key] = disp
 
-            name_counts[key] += 1
-            name_ids[key][aid] += 1
 
-            if key not in name_display:
-                name_display[key] = disp
-            else:
-                if len(disp) > len(name_display[key]):
-                    name_display[key] = disp
+def rank_coauthors(
+    name_counts: Dict[str, int],
+    name_ids: Dict[str, Dict[str, int]],
+    name_display: Dict[str, str],
+    top_n: int = TOP_COAUTHORS,
+) -> List[Dict[str, Any]]:
+    # Rank on precomputed (count, name) keys; only the winners get a dict.
+    keyed = [((c, name_display.get(key, "Unknown")), key) for key, c in name_counts.items()]
+    top = heapq.nlargest(top_n, keyed, key=itemgetter(0))
 
     items: List[Dict[str, Any]] = []
-    for key, c in name_counts.items():
+    for (c, name), key in top:
         best_id = None
         if key in name_ids and name_ids[key]:
-            best_id = name_ids[key].most_common(1)[0][0]
+            best_id = max(name_ids[key].items(), key=lambda kv: kv[1])[0]
 
         items.append({
             "name_key": key,
-            "name": name_display.get(key, "Unknown"),
+            "name": name,
             "count": c,
             "author_id": best_id,
             "merged_ids": len(name_ids[key]) if key in name_ids else 0,
         })
 
-    items.sort(key=lambda x: (x["count"], x["name"]), reverse=True)
-    return items[:top_n], len(article_works)
+    return items
+
+
+# ----------------------------
+# Combined ranking (single pass over raw works)
+# ----------------------------
+def build_rankings(
+    raw_works: List[Dict[str, Any]],
+    main_author_id: str,
+    top_papers: int = TOP_PAPERS,
+    top_coauthors: int = TOP_COAUTHORS,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Compute both rankings in one pass over the raw works.
+    Papers are ranked by citation rate over works with an int year; co-authors
+    are tallied over published articles only. Only the top papers get
+    normalized.
+    Returns (paper_ranking, coauthor_ranking, counts).
+    """
+    now = current_year()
+    main_id = _canonical_author_id(main_author_id)
+
+    dated: List[Dict[str, Any]] = []
+    years: List[int] = []
+    cites: List[int] = []
+    titles: List[str] = []
+    with_year = 0
+
+    # Plain dicts + .get(): cheaper per increment than Counter/defaultdict.
+    name_counts: Dict[str, int] = {}
+    name_display: Dict[str, str] = {}
+    name_ids: Dict[str, Dict[str, int]] = {}
+    articles = 0
+
+    for w in raw_works:
+        y = w.get("publication_year")
+        if y is not None:
+            with_year += 1
+            if isinstance(y, int):
+                dated.append(w)
+                years.append(y)
+                cites.append(int(w.get("cited_by_count") or 0))
+                titles.append(w.get("title") or "")
+
+        if is_published_article(w):
+            articles += 1
+            tally_coauthors(w, main_id, name_counts, name_ids, name_display)
+
+    paper_ranking = []
+    for i, rate in select_top_rated(years, cites, titles, now, top_papers):
+        item = normalize_work(dated[i])
+        item["citation_rate"] = rate
+        paper_ranking.append(item)
+
+    coauthor_ranking = rank_coauthors(name_counts, name_ids, name_display, top_coauthors)
+
+    counts = {
+        "count_works_total": len(raw_works),
+        "count_works_with_year": with_year,
+        "counted_article_works": articles,
+    }
+    return paper_ranking, coauthor_ranking, counts
+
+
+async def run_build_rankings(
+    raw_works: List[Dict[str, Any]],
+    main_author_id: str,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Dict[str, int]]:
+    """
+    build_rankings off the event loop, in a worker thread; the result is
+    stored in RANKINGS_CACHE.
+    A process pool would have to pickle the raw works, which costs several
+    times more than the ranking pass itself.
+    """
+    rankings = await asyncio.to_thread(build_rankings, raw_works, main_author_id)
+    RANKINGS_CACHE.set(rankings_cache_key(main_author_id), rankings)
+    return rankings
+
+
+def rankings_cache_key(author_id: str) -> Tuple[str, int]:
+    return (_canonical_author_id(author_id), current_year())
+
+
+async def get_rankings(
+    client: httpx.AsyncClient,
+    author_id: str,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Dict[str, int]]:
+    """
+    build_rankings output for an author, from RANKINGS_CACHE when possible.
+    """
+    cached = RANKINGS_CACHE.get(rankings_cache_key(author_id))
+    if cached is not None:
+        return cached
+
+    raw = await fetch_openalex_works(client, author_id)
+    return await run_build_rankings(raw, author_id)
 
 
 # ----------------------------
 # Rendering helpers
 # ----------------------------
+# Venues, work types and co-author names repeat across rows.
+escape_html = lru_cache(maxsize=8192)(html.escape)
+
+# Shared by both tables: rank, cell HTML, score.
+TABLE_ROW_HTML = '<tr><td class="rank">{rank}</td><td class="work">{cell}</td><td class="score">{score}</td></tr>'
+
+
 def work_cell_html(w: Dict[str, Any]) -> str:
-    title = html.escape(w.get("title") or "Untitled")
-    authors = html.escape(w.get("authors") or "")
-    url = w.get("url") or ""
+    title = escape_html(w.get("title") or "Untitled")
+    authors = escape_html(w.get("authors") or "")
+    safe_url = escape_html(w.get("url") or "")
     doi = w.get("doi")
 
     links = []
-    if url:
-        links.append(f'<a href="{html.escape(url)}" target="_blank" rel="noopener">OpenAlex</a>')
+    if safe_url:
+        links.append(f'<a href="{safe_url}" target="_blank" rel="noopener">OpenAlex</a>')
     if doi:
-        links.append(f'<a href="https://doi.org/{html.escape(doi)}" target="_blank" rel="noopener">DOI</a>')
+        links.append(f'<a href="https://doi.org/{escape_html(doi)}" target="_blank" rel="noopener">DOI</a>')
 
     links_html = " · ".join(links) if links else ""
-    venue = html.escape(w.get("primary_location") or "")
+    venue = escape_html(w.get("primary_location") or "")
     year = w.get("year") or ""
     cites = w.get("citations", 0)
-    wtype = html.escape((w.get("type") or "").replace("_", " "))
+    wtype = escape_html((w.get("type") or "").replace("_", " "))
 
-    meta = f"{year} — {cites} citations"
+    meta = [f"{year} — {cites} citations"]
     if venue:
-        meta += f" — {venue}"
+        meta.append(venue)
     if wtype:
-        meta += f" — {wtype}"
-
-    authors_line = f'<div class="authors">Authors: {authors}</div>' if authors else ""
+        meta.append(wtype)
 
-    return f"""
-    <div class="title">{title}</div>
-    {authors_line}
-    <div class="meta">{meta}</div>
-    <div class="links">{links_html}</div>
-    """
+    parts = [f'<div class="title">{title}</div>']
+    if authors:
+        parts.append(f'<div class="authors">Authors: {authors}</div>')
+    parts.append(f'<div class="meta">{" — ".join(meta)}</div>')
+    parts.append(f'<div class="links">{links_html}</div>')
+    return "".join(parts)
 
 
 def format_rate(x: float) -> str:
@@ -355,170 +703,105 @@ def format_rate(x: float) -> str:
 
 
 def author_cell_html(author_id: Optional[str], name: str, merged_ids: int) -> str:
-    safe_name = html.escape(name or "Unknown")
+    safe_name = escape_html(name or "Unknown")
+    extra = f" · merged IDs: {merged_ids}" if merged_ids and merged_ids > 1 else ""
     if author_id:
-        safe_id = html.escape(author_id)
-        link = f'<a href="{safe_id}" target="_blank" rel="noopener">{safe_name}</a>'
-        extra = f" · merged IDs: {merged_ids}" if merged_ids and merged_ids > 1 else ""
-        return f"""
-        <div class="title">{link}</div>
-        <div class="meta">{safe_id}{extra}</div>
-        """
+        safe_id = escape_html(author_id)
+        return "".join([
+            f'<div class="title"><a href="{safe_id}" target="_blank" rel="noopener">{safe_name}</a></div>',
+            f'<div class="meta">{safe_id}{extra}</div>',
+        ])
     else:
-        extra = f" · merged IDs: {merged_ids}" if merged_ids and merged_ids > 1 else ""
-        return f"""
-        <div class="title">{safe_name}</div>
-        <div class="meta">No OpenAlex link{extra}</div>
-        """
-
-
-# ----------------------------
-# Routes
-# ----------------------------
-@app.get("/")
-async def root():
-    return {
-        "message": "OK",
-        "endpoints": ["/author_search", "/ranking_html", "/ranking", "/docs"],
-        "source": "openalex",
-        "tools": [
-            f"top_papers_by_citation_rate (top {TOP_PAPERS})",
-            f"top_coauthors_by_joint_articles (top {TOP_COAUTHORS})",
-        ],
-    }
-
-
-@app.get("/author_search")
-async def author_search(
-    name: str = Query(..., min_length=2),
-    per_page: int = Query(8, ge=1, le=25),
-):
-    results = await search_openalex_authors(name, per_page=per_page)
-    return JSONResponse({"query": name, "source": "openalex", "results": results})
-
-
-@app.get("/ranking")
-async def ranking(
-    author_id: str = Query(..., description="OpenAlex Author ID like A123... or full URL"),
-):
-    raw = await fetch_openalex_works(author_id)
-    works = [normalize_work(w) for w in raw if w.get("publication_year") is not None]
-
-    paper_ranking = compute_rate_ranking(works, top_n=TOP_PAPERS)
-    coauthor_ranking, counted_articles = compute_coauthor_ranking_articles_only_merge_by_name(
-        raw, main_author_id=author_id, top_n=TOP_COAUTHORS
-    )
+        return "".join([
+            f'<div class="title">{safe_name}</div>',
+            f'<div class="meta">No OpenAlex link{extra}</div>',
+        ])
 
-    return {
-        "source": "openalex",
-        "author_id": author_id,
-        "count_works_total": len(raw),
-        "count_works_with_year": len(works),
-        "current_year": current_year(),
-        "paper_ranking": {
-            "top_n": TOP_PAPERS,
-            "formula": "citations / (1 + current_year - year)",
-            "items": paper_ranking,
-        },
-        "coauthor_ranking": {
-            "top_n": TOP_COAUTHORS,
-            "scope": "articles_only (type == 'article')",
-            "counted_article_works": counted_articles,
-            "items": coauthor_ranking,
-        },
-    }
-
-
-@app.get("/ranking_html", response_class=HTMLResponse)
-async def ranking_html(
-    author_id: Optional[str] = Query(None, description="OpenAlex Author ID like A123... or full URL"),
-    tab: str = Query("papers", description="papers|coauthors"),
-):
-    author_display = "-"
-    papers_table_html = "<div class='empty'>Search an author above, then click “Use” to display analysis.</div>"
-    coauthors_table_html = "<div class='empty'>Search an author above, then click “Use” to display analysis.</div>"
 
-    if author_id:
-        raw = await fetch_openalex_works(author_id)
-        works = [normalize_work(w) for w in raw if w.get("publication_year") is not None]
-
-        # Tab 1: papers
-        ranked_papers = compute_rate_ranking(works, top_n=TOP_PAPERS)
-        paper_rows = []
-        for i, w in enumerate(ranked_papers, start=1):
-            rate = float(w.get("citation_rate") or 0.0)
-            paper_rows.append(
-                f"""
-                <tr>
-                  <td class="rank">{i}</td>
-                  <td class="work">{work_cell_html(w)}</td>
-                  <td class="score">{format_rate(rate)}</td>
-                </tr>
-                """
-            )
-        papers_table_html = f"""
-        <div class="card">
-          <div class="cardhead">
-            <div class="cardtitle">Top {TOP_PAPERS} papers by citation rate</div>
-            <div class="cardsub">Score = <code>citations / (1 + current_year - year)</code> · current_year = {current_year()}</div>
-          </div>
-          <table>
-            <thead>
-              <tr>
-                <th>Rank</th>
-                <th>Paper</th>
-                <th>Citation rate</th>
-              </tr>
-            </thead>
-            <tbody>
-              {"".join(paper_rows)}
-            </tbody>
-          </table>
-        </div>
-        """
+async def render_ranking_tables(
+    client: httpx.AsyncClient,
+    author_id: str,
+) -> Tuple[str, str]:
+    """
+    Render the papers and co-authors tables for /ranking_html.
+    Both are deterministic functions of the works list, so they are cached.
+    """
+    cache_key = rankings_cache_key(author_id)
+    cached = RENDERED_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    ranked_papers, ranked_coauthors, counts = await get_rankings(client, author_id)
+    counted_articles = counts["counted_article_works"]
+
+    # Tab 1: papers
+    row = TABLE_ROW_HTML.format
+    paper_rows = [
+        row(rank=i, cell=work_cell_html(w), score=format_rate(float(w.get("citation_rate") or 0.0)))
+        for i, w in enumerate(ranked_papers, start=1)
+    ]
+    papers_table_html = f"""
+    <div class="card">
+      <div class="cardhead">
+        <div class="cardtitle">Top {TOP_PAPERS} papers by citation rate</div>
+        <div class="cardsub">Score = <code>citations / (1 + current_year - year)</code> · current_year = {current_year()}</div>
+      </div>
+      <table>
+        <thead>
+          <tr>
+            <th>Rank</th>
+            <th>Paper</th>
+            <th>Citation rate</th>
+          </tr>
+        </thead>
+        <tbody>
+          {"".join(paper_rows)}
+        </tbody>
+      </table>
+    </div>
+    """
 
-        # Tab 2: coauthors (articles only)
-        ranked_coauthors, counted_articles = compute_coauthor_ranking_articles_only_merge_by_name(
-            raw, main_author_id=author_id, top_n=TOP_COAUTHORS
+    # Tab 2: coauthors (articles only)
+    coauthor_rows = [
+        row(
+            rank=i,
+            cell=author_cell_html(a.get("author_id"), a.get("name"), a.get("merged_ids", 0)),
+            score=a.get("count", 0),
         )
+        for i, a in enumerate(ranked_coauthors, start=1)
+    ]
+    coauthors_table_html = f"""
+    <div class="card">
+      <div class="cardhead">
+        <div class="cardtitle">Top {TOP_COAUTHORS} co-authors by number of joint works</div>
+        <div class="cardsub">Computed on {counted_articles} published articles only (type = <code>article</code>).</div>
+      </div>
+      <table>
+        <thead>
+          <tr>
+            <th>Rank</th>
+            <th>Co-author</th>
+            <th>Joint works</th>
+          </tr>
+        </thead>
+        <tbody>
+          {"".join(coauthor_rows)}
+        </tbody>
+      </table>
+    </div>
+    """
 
-        coauthor_rows = []
-        for i, a in enumerate(ranked_coauthors, start=1):
-            coauthor_rows.append(
-                f"""
-                <tr>
-                  <td class="rank">{i}</td>
-                  <td class="work">{author_cell_html(a.get("author_id"), a.get("name"), a.get("merged_ids", 0))}</td>
-                  <td class="score">{a.get("count", 0)}</td>
-                </tr>
-                """
-            )
-        coauthors_table_html = f"""
-        <div class="card">
-          <div class="cardhead">
-            <div class="cardtitle">Top {TOP_COAUTHORS} co-authors by number of joint works</div>
-            <div class="cardsub">Computed on {counted_articles} published articles only (type = <code>article</code>).</div>
-          </div>
-          <table>
-            <thead>
-              <tr>
-                <th>Rank</th>
-                <th>Co-author</th>
-                <th>Joint works</th>
-              </tr>
-            </thead>
-            <tbody>
-              {"".join(coauthor_rows)}
-            </tbody>
-          </table>
-        </div>
-        """
-
-        author_display = html.escape(author_id)
+    tables = (papers_table_html, coauthors_table_html)
+    RENDERED_CACHE.set(cache_key, tables)
+    return tables
 
-    init_tab = "coauthors" if (tab or "").lower().strip() == "coauthors" else "papers"
 
-    page = f"""
+# ----------------------------
+# Static page shell for /ranking_html
+# ----------------------------
+# Built once at import: only the author, the two tables and the initial tab
+# are interpolated per request, between these fixed segments.
+RANKING_PAGE_HEAD = """
     <!doctype html>
     <html lang="en">
     <head>
@@ -526,7 +809,7 @@ async def ranking_html(
       <meta name="viewport" content="width=device-width, initial-scale=1"/>
       <title>Author profile analysis</title>
       <style>
-        :root {{
+        :root {
           --bg: #0b1020;
           --text: #e9ecf5;
           --muted: #aab3d3;
@@ -536,54 +819,54 @@ async def ranking_html(
           --accent: #7aa2ff;
           --tab: rgba(255,255,255,0.07);
           --tabActive: rgba(122,162,255,0.20);
-        }}
-        body {{
+        }
+        body {
           margin: 0;
           font-family: ui-sans-serif, system-ui, -apple-system, Segoe UI, Roboto, Helvetica, Arial, "Apple Color Emoji","Segoe UI Emoji";
           background: radial-gradient(1200px 600px at 20% 0%, rgba(122,162,255,0.25), transparent 60%),
                       radial-gradient(900px 500px at 100% 0%, rgba(126,255,191,0.10), transparent 55%),
                       var(--bg);
           color: var(--text);
-        }}
-        .wrap {{
+        }
+        .wrap {
           max-width: 1150px;
           margin: 40px auto;
           padding: 0 16px;
-        }}
-        .header {{
+        }
+        .header {
           display: flex;
           align-items: baseline;
           justify-content: space-between;
           gap: 16px;
           margin-bottom: 14px;
           flex-wrap: wrap;
-        }}
-        h1 {{
+        }
+        h1 {
           font-size: 22px;
           margin: 0;
           letter-spacing: 0.2px;
-        }}
-        .sub {{
+        }
+        .sub {
           color: var(--muted);
           font-size: 13px;
           line-height: 1.35;
-        }}
+        }
 
-        .search {{
+        .search {
           border: 1px solid var(--border);
           border-radius: 18px;
           padding: 14px 14px;
           margin-bottom: 16px;
           background: rgba(255,255,255,0.03);
           box-shadow: 0 10px 30px rgba(0,0,0,0.25);
-        }}
-        .searchbar {{
+        }
+        .searchbar {
           display: flex;
           gap: 10px;
           flex-wrap: wrap;
           align-items: center;
-        }}
-        input[type="text"] {{
+        }
+        input[type="text"] {
           flex: 1;
           min-width: 240px;
           padding: 10px 12px;
@@ -592,8 +875,8 @@ async def ranking_html(
           background: rgba(0,0,0,0.25);
           color: var(--text);
           outline: none;
-        }}
-        button {{
+        }
+        button {
           padding: 10px 12px;
           border-radius: 12px;
           border: 1px solid var(--border);
@@ -601,17 +884,17 @@ async def ranking_html(
           color: var(--text);
           cursor: pointer;
           font-weight: 650;
-        }}
-        button:hover {{
+        }
+        button:hover {
           background: rgba(122,162,255,0.25);
-        }}
-        .results {{
+        }
+        .results {
           margin-top: 12px;
           display: grid;
           grid-template-columns: 1fr;
           gap: 10px;
-        }}
-        .result {{
+        }
+        .result {
           border: 1px solid var(--border);
           border-radius: 14px;
           padding: 10px 12px;
@@ -620,38 +903,38 @@ async def ranking_html(
           justify-content: space-between;
           gap: 12px;
           align-items: center;
-        }}
-        .rmain {{
+        }
+        .rmain {
           display: flex;
           flex-direction: column;
           gap: 4px;
-        }}
-        .rname {{
+        }
+        .rname {
           font-weight: 750;
-        }}
-        .rmeta {{
+        }
+        .rmeta {
           color: var(--muted);
           font-size: 12.5px;
           line-height: 1.25;
-        }}
-        .use {{
+        }
+        .use {
           padding: 8px 10px;
           border-radius: 12px;
           border: 1px solid var(--border);
           background: rgba(61,220,151,0.10);
           white-space: nowrap;
-        }}
-        .use:hover {{
+        }
+        .use:hover {
           background: rgba(61,220,151,0.18);
-        }}
+        }
 
         /* Tabs */
-        .tabs {{
+        .tabs {
           display: flex;
           gap: 10px;
           margin: 12px 0 14px 0;
-        }}
-        .tab {{
+        }
+        .tab {
           padding: 10px 12px;
           border-radius: 14px;
           border: 1px solid var(--border);
@@ -661,53 +944,53 @@ async def ranking_html(
           font-size: 13px;
           color: var(--text);
           user-select: none;
-        }}
-        .tab.active {{
+        }
+        .tab.active {
           background: var(--tabActive);
-        }}
-        .panel {{
+        }
+        .panel {
           display: none;
-        }}
-        .panel.active {{
+        }
+        .panel.active {
           display: block;
-        }}
+        }
 
-        .card {{
+        .card {
           background: linear-gradient(180deg, rgba(255,255,255,0.05), rgba(255,255,255,0.02));
           border: 1px solid var(--border);
           border-radius: 18px;
           overflow: hidden;
           box-shadow: 0 10px 30px rgba(0,0,0,0.35);
-        }}
-        .cardhead {{
+        }
+        .cardhead {
           padding: 14px 16px;
           border-bottom: 1px solid var(--border);
           background: rgba(0,0,0,0.15);
-        }}
-        .cardtitle {{
+        }
+        .cardtitle {
           font-weight: 800;
           font-size: 14px;
           letter-spacing: 0.02em;
-        }}
-        .cardsub {{
+        }
+        .cardsub {
           margin-top: 6px;
           color: var(--muted);
           font-size: 12.5px;
           line-height: 1.35;
-        }}
-        code {{
+        }
+        code {
           background: rgba(0,0,0,0.25);
           padding: 2px 6px;
           border-radius: 8px;
           border: 1px solid var(--border);
           color: var(--text);
-        }}
+        }
 
-        table {{
+        table {
           width: 100%;
           border-collapse: collapse;
-        }}
-        thead th {{
+        }
+        thead th {
           text-align: left;
           font-size: 12px;
           text-transform: uppercase;
@@ -716,75 +999,75 @@ async def ranking_html(
           padding: 14px 16px;
           border-bottom: 1px solid var(--border);
           background: rgba(0,0,0,0.10);
-        }}
-        tbody tr:nth-child(odd) {{
+        }
+        tbody tr:nth-child(odd) {
           background: var(--row1);
-        }}
-        tbody tr:nth-child(even) {{
+        }
+        tbody tr:nth-child(even) {
           background: var(--row2);
-        }}
-        td {{
+        }
+        td {
           vertical-align: top;
           padding: 14px 16px;
           border-bottom: 1px solid var(--border);
-        }}
-        td.rank {{
+        }
+        td.rank {
           width: 70px;
           font-weight: 800;
           font-size: 15px;
           color: #ffffff;
           white-space: nowrap;
-        }}
-        td.score {{
+        }
+        td.score {
           width: 160px;
           font-weight: 800;
           font-size: 14px;
           color: #ffffff;
           white-space: nowrap;
           text-align: right;
-        }}
+        }
 
-        .title {{
+        .title {
           font-weight: 650;
           font-size: 14px;
           line-height: 1.35;
           margin-bottom: 4px;
-        }}
-        .authors {{
+        }
+        .authors {
           color: var(--muted);
           font-size: 12.5px;
           line-height: 1.35;
           margin-bottom: 6px;
-        }}
-        .meta {{
+        }
+        .meta {
           color: var(--muted);
           font-size: 12.5px;
           line-height: 1.35;
           margin-bottom: 6px;
-        }}
-        a {{
+        }
+        a {
           color: var(--accent);
           text-decoration: none;
-        }}
-        a:hover {{
+        }
+        a:hover {
           text-decoration: underline;
-        }}
-        .links {{
+        }
+        .links {
           font-size: 12.5px;
-        }}
-        .empty {{
+        }
+        .empty {
           color: var(--muted);
           padding: 18px;
           border: 1px dashed var(--border);
           border-radius: 18px;
           text-align: center;
-        }}
-        .footer {{
+        }
+        .footer {
           color: var(--muted);
           font-size: 12px;
           margin-top: 12px;
           text-align: right;
-        }}
+        }
       </style>
     </head>
     <body>
@@ -794,7 +1077,9 @@ async def ranking_html(
             <h1>Author profile analysis</h1>
             <div class="sub">Tools: Top papers by citation rate, Top co-authors (published articles only)</div>
           </div>
-          <div class="sub">Author: {author_display} · source: OpenAlex</div>
+          <div class="sub">Author: """
+
+RANKING_PAGE_AFTER_AUTHOR = """ · source: OpenAlex</div>
         </div>
 
         <div class="search">
@@ -812,86 +1097,90 @@ async def ranking_html(
         </div>
 
         <div id="panel-papers" class="panel">
-          {papers_table_html}
+          """
+
+RANKING_PAGE_AFTER_PAPERS = """
         </div>
 
         <div id="panel-coauthors" class="panel">
-          {coauthors_table_html}
+          """
+
+RANKING_PAGE_AFTER_COAUTHORS = """
         </div>
 
         <div class="footer">Data: OpenAlex · local HTML rendering</div>
       </div>
 
       <script>
-        function showTab(which) {{
+        function showTab(which) {
           const tabP = document.getElementById("tab-papers");
           const tabC = document.getElementById("tab-coauthors");
           const panP = document.getElementById("panel-papers");
           const panC = document.getElementById("panel-coauthors");
 
-          if (which === "coauthors") {{
+          if (which === "coauthors") {
             tabC.classList.add("active");
             tabP.classList.remove("active");
             panC.classList.add("active");
             panP.classList.remove("active");
-          }} else {{
+          } else {
             tabP.classList.add("active");
             tabC.classList.remove("active");
             panP.classList.add("active");
             panC.classList.remove("active");
-          }}
+          }
 
           const params = new URLSearchParams(window.location.search);
           params.set("tab", which);
           const newUrl = window.location.pathname + "?" + params.toString();
           window.history.replaceState(null, "", newUrl);
-        }}
+        }
 
-        async function doSearch() {{
+        async function doSearch() {
           const q = document.getElementById("q").value.trim();
           const status = document.getElementById("status");
           const results = document.getElementById("results");
           results.innerHTML = "";
-          if (q.length < 2) {{
+          if (q.length < 2) {
             status.textContent = "Please type at least 2 characters.";
             return;
-          }}
+          }
           status.textContent = "Searching...";
-          try {{
-            const r = await fetch(`/author_search?name=${{encodeURIComponent(q)}}`);
+          try {
+            const r = await fetch(`/author_search?name=${encodeURIComponent(q)}`);
             const data = await r.json();
             const items = data.results || [];
-            if (!items.length) {{
+            if (!items.length) {
               status.textContent = "No results.";
               return;
-            }}
-            status.textContent = `Results for "${{q}}":`;
-            for (const a of items) {{
+            }
+            status.textContent = `Results for "${q}":`;
+            for (const a of items) {
               const div = document.createElement("div");
               div.className = "result";
               const concepts = (a.concepts || []).filter(Boolean).join(", ");
               div.innerHTML = `
                 <div class="rmain">
-                  <div class="rname">${{a.display_name || "-"}}</div>
+                  <div class="rname">${a.display_name || "-"}</div>
                   <div class="rmeta">
-                    ID: <span style="color:#e9ecf5">${{a.id || "-"}}</span>
-                    · Works: ${{a.works_count ?? "-"}}
-                    · Citations: ${{a.cited_by_count ?? "-"}}
-                    ${{a.last_known_institution ? " · " + a.last_known_institution : ""}}
-                    ${{a.orcid ? " · ORCID: " + a.orcid : ""}}
-                    ${{concepts ? "<br/>Concepts: " + concepts : ""}}
+                    ID: <span style="color:#e9ecf5">${a.id || "-"}</span>
+                    · Works: ${a.works_count ?? "-"}
+                    · Citations: ${a.cited_by_count ?? "-"}
+                    ${a.last_known_institution ? " · " + a.last_known_institution : ""}
+                    ${a.orcid ? " · ORCID: " + a.orcid : ""}
+                    ${concepts ? "<br/>Concepts: " + concepts : ""}
                   </div>
                 </div>
-                <button class="use" onclick="useAuthor('${{a.id}}')">Use</button>
+                <button class="use" onclick="useAuthor('${a.id}')">Use</button>
               `;
               results.appendChild(div);
-            }}
-          }} catch (e) {{
+            }
+          } catch (e) {
             status.textContent = "Error during search.";
-          }}
-        }}
+          }
+        }
 
-        function useAuthor(id) {{
+        function useAuthor(id) {
           const params = new URLSearchParams(window.location.search);
           params.set("author_id", id);
 
@@ -899,19 +1188,157 @@ async def ranking_html(
           params.set("tab", active);
 
           window.location.search = params.toString();
-        }}
+        }
 
-        document.addEventListener("DOMContentLoaded", () => {{
+        document.addEventListener("DOMContentLoaded", () => {
           const q = document.getElementById("q");
-          q.addEventListener("keydown", (e) => {{
+          q.addEventListener("keydown", (e) => {
             if (e.key === "Enter") doSearch();
-          }});
+          });
 
-          showTab("{'coauthors' if (tab or '').lower().strip() == 'coauthors' else 'papers'}");
-        }});
+          showTab(\""""
+
+RANKING_PAGE_TAIL = """");
+        });
       </script>
     </body>
     </html>
     """
 
+
+# ----------------------------
+# Routes
+# ----------------------------
+@app.get("/")
+async def root():
+    return {
+        "message": "OK",
+        "endpoints": ["/author_search", "/ranking_html", "/ranking", "/docs"],
+        "source": "openalex",
+        "tools": [
+            f"top_papers_by_citation_rate (top {TOP_PAPERS})",
+            f"top_coauthors_by_joint_articles (top {TOP_COAUTHORS})",
+        ],
+    }
+
+
+@app.get("/author_search")
+async def author_search(
+    request: Request,
+    name: str = Query(..., min_length=2),
+    per_page: int = Query(8, ge=1, le=25),
+):
+    results = await search_openalex_authors(request.app.state.client, name, per_page=per_page)
+    return {"query": name, "source": "openalex", "results": results}
+
+
+def paper_ranking_section(items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "top_n": TOP_PAPERS,
+        "formula": "citations / (1 + current_year - year)",
+        "items": items,
+    }
+
+
+def coauthor_ranking_section(items: List[Dict[str, Any]], counted_articles: int) -> Dict[str, Any]:
+    return {
+        "top_n": TOP_COAUTHORS,
+        "scope": "articles_only (type == 'article')",
+        "counted_article_works": counted_articles,
+        "items": items,
+    }
+
+
+async def ranking_ndjson(
+    author_id: str,
+    raw: Optional[List[Dict[str, Any]]],
+    rankings: Optional[Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Dict[str, int]]],
+) -> AsyncIterator[bytes]:
+    """
+    /ranking as NDJSON: a header line sent as soon as the works are fetched,
+    then one line per ranking. Merging the lines gives the JSON response.
+    Takes either the raw works or already cached rankings.
+    """
+    yield orjson.dumps({
+        "source": "openalex",
+        "author_id": author_id,
+        "count_works_total": len(raw) if raw is not None else rankings[2]["count_works_total"],
+        "current_year": current_year(),
+    }) + b"\n"
+
+    if rankings is None:
+        rankings = await run_build_rankings(raw, author_id)
+    paper_ranking, coauthor_ranking, counts = rankings
+
+    yield orjson.dumps({
+        "count_works_with_year": counts["count_works_with_year"],
+        "paper_ranking": paper_ranking_section(paper_ranking),
+    }) + b"\n"
+    yield orjson.dumps({
+        "coauthor_ranking": coauthor_ranking_section(coauthor_ranking, counts["counted_article_works"]),
+    }) + b"\n"
+
+
+@app.get("/ranking")
+async def ranking(
+    request: Request,
+    author_id: str = Query(..., description="OpenAlex Author ID like A123... or full URL"),
+    stream: bool = Query(False, description="Stream NDJSON lines (header, papers, co-authors)"),
+):
+    client = request.app.state.client
+    if stream:
+        rankings = RANKINGS_CACHE.get(rankings_cache_key(author_id))
+        raw = None if rankings is not None else await fetch_openalex_works(client, author_id)
+        # GZipMiddleware buffers a streamed body until it ends; an explicit
+        # Content-Encoding makes it pass the stream through line by line.
+        return StreamingResponse(
+            ranking_ndjson(author_id, raw, rankings),
+            media_type="application/x-ndjson",
+            headers={"Content-Encoding": "identity"},
+        )
+
+    paper_ranking, coauthor_ranking, counts = await get_rankings(client, author_id)
+
+    return {
+        "source": "openalex",
+        "author_id": author_id,
+        "count_works_total": counts["count_works_total"],
+        "count_works_with_year": counts["count_works_with_year"],
+        "current_year": current_year(),
+        "paper_ranking": paper_ranking_section(paper_ranking),
+        "coauthor_ranking": coauthor_ranking_section(coauthor_ranking, counts["counted_article_works"]),
+    }
+
+
+@app.get("/ranking_html", response_class=HTMLResponse)
+async def ranking_html(
+    request: Request,
+    author_id: Optional[str] = Query(None, description="OpenAlex Author ID like A123... or full URL"),
+    tab: str = Query("papers", description="papers|coauthors"),
+):
+    author_display = "-"
+    papers_table_html = "<div class='empty'>Search an author above, then click “Use” to display analysis.</div>"
+    coauthors_table_html = "<div class='empty'>Search an author above, then click “Use” to display analysis.</div>"
+
+    if author_id:
+        papers_table_html, coauthors_table_html = await render_ranking_tables(
+            request.app.state.client, author_id
+        )
+
+        author_display = html.escape(author_id)
+
+    init_tab = "coauthors" if (tab or "").lower().strip() == "coauthors" else "papers"
+
+    page = "".join([
+        RANKING_PAGE_HEAD,
+        author_display,
+        RANKING_PAGE_AFTER_AUTHOR,
+        papers_table_html,
+        RANKING_PAGE_AFTER_PAPERS,
+        coauthors_table_html,
+        RANKING_PAGE_AFTER_COAUTHORS,
+        init_tab,
+        RANKING_PAGE_TAIL,
+    ])
+
     return HTMLResponse(page)
@@ -0,0 +1,50 @@
+import asyncio
+import types
+
+import orjson
+
+from app import main
+
+
+def _ids(*numbers):
+    return [{"id": f"https://openalex.org/W{n}"} for n in numbers]
+
+
+class FakeOpenAlex:
+    """Serves /works by page= from `pages`, and by cursor from `cursor_works` in one page."""
+
+    def __init__(self, pages, count, cursor_works=()):
+        self.pages = pages
+        self.count = count
+        self.cursor_works = list(cursor_works)
+        self.requests = []
+
+    async def get(self, url, params=None):
+        self.requests.append(dict(params))
+        if "cursor" in params:
+            body = {"meta": {"count": self.count, "next_cursor": None}, "results": self.cursor_works}
+        else:
+            body = {"meta": {"count": self.count}, "results": self.pages[int(params["page"]) - 1]}
+        return types.SimpleNamespace(status_code=200, content=orjson.dumps(body), text="")
+
+
+def test_fetch_openalex_works_falls_back_to_cursor_when_pages_miss_works():
+    # W2 is served on both pages, so one of the 4 counted works (W3) never arrives.
+    pages = [_ids(1, 2), _ids(2, 4)]
+    client = FakeOpenAlex(pages, count=4, cursor_works=_ids(1, 2, 3, 4))
+
+    works = asyncio.run(main.fetch_openalex_works(client, "A1", per_page=2))
+
+    assert [w["id"] for w in works] == [f"https://openalex.org/W{n}" for n in (1, 2, 3, 4)]
+    assert [r.get("cursor") for r in client.requests if "cursor" in r] == ["*"]
+
+
+def test_fetch_openalex_works_dedupes_without_fallback_when_complete():
+    # A work added between requests shifts W2 onto page 2 as well; all 3 counted works are present.
+    pages = [_ids(1, 2), _ids(2, 3)]
+    client = FakeOpenAlex(pages, count=3)
+
+    works = asyncio.run(main.fetch_openalex_works(client, "A1", per_page=2))
+
+    assert [w["id"] for w in works] == [f"https://openalex.org/W{n}" for n in (1, 2, 3)]
+    assert all("cursor" not in r for r in client.requests)
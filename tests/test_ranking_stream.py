@@ -0,0 +1,85 @@
+import asyncio
+import time
+
+import orjson
+
+from app import main
+
+
+def _drive(path: str, query: bytes, headers):
+    """
+    Call the ASGI app directly and record (time, message) for every send,
+    so the test sees exactly when each chunk leaves the app.
+    """
+    sent = []
+
+    async def run():
+        request_sent = False
+        never = asyncio.get_running_loop().create_future()
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            return await never
+
+        async def send(message):
+            sent.append((time.monotonic(), message))
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query,
+            "root_path": "",
+            "headers": headers,
+            "client": ("testclient", 50000),
+            "server": ("testserver", 80),
+        }
+        await main.app(scope, receive, send)
+
+    asyncio.run(run())
+    return sent
+
+
+def test_ndjson_header_is_sent_before_ranking_pass_finishes(monkeypatch):
+    raw = [{"id": "https://openalex.org/W1", "publication_year": 2020, "cited_by_count": 3, "type": "article"}]
+    finished = []
+
+    async def fake_fetch(client, author_id, per_page=200):
+        return raw
+
+    def slow_build_rankings(raw_works, main_author_id):
+        time.sleep(0.5)
+        finished.append(time.monotonic())
+        counts = {"count_works_total": 1, "count_works_with_year": 1, "counted_article_works": 1}
+        return [], [], counts
+
+    monkeypatch.setattr(main, "fetch_openalex_works", fake_fetch)
+    monkeypatch.setattr(main, "build_rankings", slow_build_rankings)
+    monkeypatch.setattr(main, "RANKINGS_CACHE", main.TTLCache(maxsize=4))
+    monkeypatch.setattr(main.app.state, "client", None, raising=False)
+
+    # Clients such as browsers, httpx and curl --compressed ask for gzip.
+    sent = _drive(
+        "/ranking",
+        b"author_id=A1&stream=true",
+        [(b"host", b"testserver"), (b"accept-encoding", b"gzip, deflate")],
+    )
+
+    start = next(m for _, m in sent if m["type"] == "http.response.start")
+    headers = {k.decode().lower(): v.decode() for k, v in start["headers"]}
+    assert headers.get("content-encoding") != "gzip"
+
+    bodies = [(t, m["body"]) for t, m in sent if m["type"] == "http.response.body" and m.get("body")]
+    first_time, first_body = bodies[0]
+    assert orjson.loads(first_body.splitlines()[0])["count_works_total"] == 1
+    assert first_time < finished[0]
+
+    lines = b"".join(body for _, body in bodies).splitlines()
+    assert [list(orjson.loads(line))[-1] for line in lines] == ["current_year", "paper_ranking", "coauthor_ranking"]
@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+from app import main
+
+NOW = 2025
+
+
+def _reference_papers(raw, top_n):
+    """Plain full sort over normalized works, as the ranking was first written."""
+    rated = []
+    for w in raw:
+        y = w.get("publication_year")
+        if not isinstance(y, int):
+            continue
+        item = main.normalize_work(w)
+        item["citation_rate"] = main.citation_rate(item["citations"], y, NOW)
+        rated.append(item)
+    rated.sort(
+        key=lambda x: (x["citation_rate"], x["citations"], x["year"], x["title"] or ""),
+        reverse=True,
+    )
+    return rated[:top_n]
+
+
+def _work(i, year, cites, title):
+    return {
+        "id": f"https://openalex.org/W{i}",
+        "title": title,
+        "publication_year": year,
+        "cited_by_count": cites,
+        "type": "article",
+        "authorships": [],
+    }
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_build_rankings_matches_full_sort_with_ties_at_cutoff(monkeypatch, seed):
+    monkeypatch.setattr(main, "current_year", lambda: NOW)
+    rng = random.Random(seed)
+
+    raw = []
+    # A few clear winners above the cut-off.
+    for _ in range(10):
+        raw.append(_work(len(raw), 2024, rng.randint(500, 900), "Winner"))
+    # Many works tied on rate 2.0 straddle the top-30 cut-off: equal
+    # (citations, year) pairs with equal or different titles, and different
+    # (citations, year) pairs that give the same rate.
+    for _ in range(300):
+        cites, year = rng.choice([(10, 2020), (20, 2015), (2, 2024)])
+        raw.append(_work(len(raw), year, cites, rng.choice(["A", "B", "C", None])))
+    # Bulk below the cut-off, plus works the ranking must skip.
+    for _ in range(1500):
+        raw.append(_work(len(raw), rng.randint(1990, 2025), rng.randint(0, 3), "Filler"))
+    raw.append(_work(len(raw), None, 999, "No year"))
+    rng.shuffle(raw)
+
+    dated = [w for w in raw if isinstance(w["publication_year"], int)]
+    assert len(dated) >= main.RATE_VECTORIZE_MIN_WORKS
+
+    papers, _, counts = main.build_rankings(raw, "A1")
+
+    assert papers == _reference_papers(raw, main.TOP_PAPERS)
+    assert counts["count_works_with_year"] == len(dated)
+
+
+def test_rate_ranking_candidates_keeps_every_tie_at_cutoff():
+    years = [2020] * 50 + [2024] * 1000
+    cites = [10] * 50 + [1] * 1000  # 50 works tied on rate 2.0, then rate 1.0
+
+    candidates = main.rate_ranking_candidates(years, cites, NOW, 30)
+
+    assert candidates == list(range(50))